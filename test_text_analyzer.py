@@ -11,8 +11,10 @@ This module implements unit test cases for `text_analyzer.py` module.
 
 
 import unittest
+from unittest import mock
 from text_analyzer import INSERT_COST, DROP_COST, SUBSTITUTE_COST, TRANSPOSE_COST, \
-    calculate_damerau_levenshtein_distance, calculate_resemblance_score, get_match_with_score, analyze_word, analyze_paragraph
+    calculate_damerau_levenshtein_distance, calculate_resemblance_score, get_match_with_score, analyze_word, analyze_paragraph, \
+    clear_distance_cache
 
 
 class TextAnalyzer2TestCase(unittest.TestCase):
@@ -44,6 +46,20 @@ class TextAnalyzer2TestCase(unittest.TestCase):
         t = "easy"
         self.assertEqual(calculate_damerau_levenshtein_distance(s, t), 0)
 
+    def test_calculate_levenshtein_distance_with_max_dist(self):
+        self.assertEqual(calculate_damerau_levenshtein_distance("esay", "easy", max_dist=1), 1)
+        self.assertEqual(calculate_damerau_levenshtein_distance("esay", "easy", max_dist=0), 1)
+        self.assertEqual(calculate_damerau_levenshtein_distance("program", "is", max_dist=2), 3)
+        self.assertEqual(calculate_damerau_levenshtein_distance("hello", "silly", max_dist=3), 4)
+        self.assertEqual(calculate_damerau_levenshtein_distance("", "easy", max_dist=2), 3)
+        self.assertEqual(calculate_damerau_levenshtein_distance("easy", "", max_dist=2), 3)
+        self.assertEqual(calculate_damerau_levenshtein_distance("", "easy", max_dist=4), 4)
+
+    def test_calculate_levenshtein_distance_after_clear_cache(self):
+        dist = calculate_damerau_levenshtein_distance("esay", "easy")
+        clear_distance_cache()
+        self.assertEqual(calculate_damerau_levenshtein_distance("esay", "easy"), dist)
+
 
     # tests for calculate_resemblance_score
     def _test_calculate_resemblance_score_optimal_values(self, s, t):
@@ -79,6 +95,12 @@ class TextAnalyzer2TestCase(unittest.TestCase):
         self.assertEqual(len(get_match_with_score("", self.input_dict)), len(self.input_dict))
         self.assertEqual(len(get_match_with_score("", self.input_dict, limit=len(self.input_dict)+1)), len(self.input_dict))
 
+    def test_get_match_with_score_limit_same_as_full_order(self):
+        # small and large limits are selected differently, both must keep order of full result including ties
+        for limit in (1, 3, 8):
+            self.assertEqual(get_match_with_score("easy", self.input_dict, limit=limit),
+                             get_match_with_score("easy", self.input_dict)[:limit])
+
     # tests for analyze_word
     def test_analyze_word(self):
         self.assertEqual(analyze_word("eaasy", self.input_dict), ("eaasy", ["easy"]))
@@ -103,8 +125,40 @@ class TextAnalyzer2TestCase(unittest.TestCase):
     # tests for analyze paragraph
     def test_analyze_paragraph(self):
         result = analyze_paragraph("hello this si a test progam which is silly as well as eays", self.input_dict)
-        # TODO - order of result can be changed. so better write test by matching exact words
-        self.assertEqual(result, [('eays', ['easy']), ('si', ['is']), ('progam', ['program'])])
+        self.assertEqual(result, [('si', ['is']), ('progam', ['program']), ('eays', ['easy'])])
+
+    def test_analyze_paragraph_with_repeated_words(self):
+        result = analyze_paragraph("Eays hello eays si EAYS", self.input_dict)
+        self.assertEqual(result, [('Eays', ['easy']), ('si', ['is'])])
+
+    def test_analyze_paragraph_with_workers(self):
+        text = "hello this si a test progam which is silly as well as eays"
+        self.assertEqual(analyze_paragraph(text, self.input_dict, workers=2), analyze_paragraph(text, self.input_dict))
+
+    def test_analyze_paragraph_with_common_prefix_words(self):
+        input_dict = ["test", "tests", "tester", "team"]
+        self.assertEqual(analyze_paragraph("tset", input_dict), [('tset', ['test'])])
+        self.assertEqual(analyze_paragraph("testr", input_dict), [('testr', ['tester'])])
+        self.assertEqual(analyze_paragraph("tema", input_dict), [('tema', ['team'])])
+
+    def test_analyze_paragraph_same_as_analyze_word(self):
+        # duplicate and empty dictionary words share trie nodes, paragraph must still match per word analysis
+        input_dict = ["test", "", "tests", "test", "team", "tea", "tests"]
+        text = "tset teams te x tesst eat"
+        expected = [analyze_word(word, input_dict, strict=True) for word in text.split()]
+        self.assertEqual(analyze_paragraph(text, input_dict), [i for i in expected if i[1]])
+
+    def test_analyze_paragraph_with_pruned_words(self):
+        # With default costs, rows never exceed max distance allowed by RESEMBLANCE_THRESHOLD of 0.4, so raise it
+        # to make trie skip subtrees whose common prefix is already too far from the word.
+        input_dict = ["abcdefgh", "abcdefghij", "abcx"]
+        text = "zzzz abcdefgx abcy"
+        for threshold in (0.7, 0.9):
+            with mock.patch("text_analyzer.RESEMBLANCE_THRESHOLD", threshold):
+                expected = [analyze_word(word, input_dict, strict=True) for word in text.split()]
+                self.assertEqual(analyze_paragraph(text, input_dict), [i for i in expected if i[1]])
+        with mock.patch("text_analyzer.RESEMBLANCE_THRESHOLD", 0.7):
+            self.assertEqual(analyze_paragraph(text, input_dict), [('abcdefgx', ['abcdefgh']), ('abcy', ['abcx'])])
 
 
 if __name__ == "__main__":
@@ -6,17 +6,20 @@
 ASCII Text Analyzer
 
 This module implements APIs to analyze text for possible errors and provide suggestions against input dictionary
-using Damerau-Levenshtein Distance algorithm. Here, Damerau-Levenshtein Distance is calculated by using Iterative Matrix method.
+using Damerau-Levenshtein Distance algorithm. Here, Damerau-Levenshtein Distance is calculated by using Iterative Matrix method,
+keeping only the last three rows of matrix in memory.
 
 
 usage:
-text_analyzer.py [-h] [-t T] [-f F] [-d D]
+text_analyzer.py [-h] [-t T] [-f F] [-d D] [-w W]
 optional arguments:
   -h, --help  show this help message and exit
   -t T        Input text to be analyzed
   -f F        Input file path containing text to be analyzed
   -d D        Input file path of dictionary to be used with analyzer. Each new
               word should be on new line.
+  -w W        Number of processes to analyze words in parallel. Useful for
+              large dictionaries.
 
 
 References:
@@ -26,15 +29,17 @@ References:
 @author: Rohit Chormale
 """
 
-import decimal
-decimal.getcontext().prec = 6
-from decimal import Decimal
+import heapq
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 
 INSERT_COST = 1
 DROP_COST = 1
 SUBSTITUTE_COST = 2
 TRANSPOSE_COST = 1
+MAX_COST = max(INSERT_COST, DROP_COST, SUBSTITUTE_COST, TRANSPOSE_COST)
 
 # if `strict` flag applied, the words having resemblance-score below this threshold, will be dropped from suggestions.
 # see func `get_match_with_score` and `analyze_word` for more info
@@ -42,56 +47,207 @@ RESEMBLANCE_THRESHOLD = 0.4
 DEFAULT_ENGLISH_DICT = ["hello", "this", "is", "a", "test", "program", "which", "silly", "as", "well", "easy"]
 
 
-def calculate_damerau_levenshtein_distance(s, t):
+def _encode(s):
     """
-    Calculate Damerau-Levenshtein distance using iterative matrix method.
+    Encode string to sequence of integer char codes, so that chars are compared as plain integers
+    inside `_damerau_levenshtein_distance`.
 
     Args:
-        s (string): source stringTrue
-        t (string): target string
+        s (string): string to encode
+
+    Returns:
+        bytes for ASCII string, else tuple of unicode code points
+    """
+    try:
+        return s.encode('ascii')
+    except UnicodeError:
+        return tuple(ord(c) for c in s)
+
+
+def _allocate_rows(size):
+    """
+    Allocate three rows (row before previous, previous and current) of matrix used by
+    `_damerau_levenshtein_distance`. These rows can be reused for all target strings up to `size - 1` chars.
+
+    Args:
+        size (int): number of cols in each row
+
+    Returns:
+        tuple of three lists
+    """
+    # Rows are kept as lists on purpose. Compact arrays (`bytearray`, `array('B')`) save memory per cell, but only
+    # three short rows are ever allocated, and interpreter indexes lists by a fast path which it does not have
+    # for arrays, which makes inner loop about 20% slower.
+    return [0] * size, [0] * size, [0] * size
+
+
+def _damerau_levenshtein_distance(s, t, prev2, prev, cur, max_dist=None):
+    """
+    Calculate Damerau-Levenshtein distance in given rows. Rows are used as scratch space and will be overwritten.
+
+    Args:
+        s (bytes): source string encoded by `_encode`
+        t (bytes): target string encoded by `_encode`
+        prev2, prev, cur (list): rows having at least `len(t) + 1` cols. see func `_allocate_rows`
+        max_dist (int): if given, stop calculation as soon as distance is known to exceed it
 
     Returns:
-        Integer value
+        Integer value. If `max_dist` is given and distance exceeds it, `max_dist + 1` is returned.
     """
 
+    # Common prefix and suffix chars cost nothing, so only the differing middle part needs a matrix.
+    # e.g. for 'easy' and 'eays' only 'as' and 'ay' are compared.
+    start = 0
+    end_s = len(s)
+    end_t = len(t)
+    while start < end_s and start < end_t and s[start] == t[start]:
+        start += 1
+    while end_s > start and end_t > start and s[end_s-1] == t[end_t-1]:
+        end_s -= 1
+        end_t -= 1
+    if start > 0 or end_s < len(s) or end_t < len(t):
+        s = s[start:end_s]
+        t = t[start:end_t]
+
     # increase matrix size null character
     rows = len(s) + 1
     cols = len(t) + 1
 
-    # create required matrix space
-    matrix = [[ 0 for j in range(cols)]for i in range(rows)]
+    # bind costs to locals, local lookups are cheaper than global lookups inside loop
+    insert_cost = INSERT_COST
+    drop_cost = DROP_COST
+    substitute_cost = SUBSTITUTE_COST
+    transpose_cost = TRANSPOSE_COST
+
+    # Every char of length difference costs at least one insert or drop operation. Also cells farther than `band`
+    # from diagonal can never be within `max_dist`, so only cells within band need to be calculated.
+    # Cells just outside band are marked with `exceeded` value.
+    min_cost = min(insert_cost, drop_cost)
+    band = rows + cols
+    if max_dist is not None:
+        exceeded = max_dist + 1
+        if abs(rows - cols) * min_cost > max_dist:
+            return exceeded
+        if min_cost > 0:
+            band = max_dist // min_cost
+
+    # Only last three rows of matrix are required at any time, i.e. current row, previous row for insert, drop and
+    # substitute operations and row before previous for transpose operation. So instead of allocating whole
+    # matrix, we will keep rotating these three rows.
 
     # calculate costs of first row (horizontal). Here 0/NULL indicates empty string.
     # As source string is empty, we can only perform insert operations to convert it in target
     for j in range(cols):
-        matrix[0][j] = j * INSERT_COST
-
-    # calculate costs of first column (vertical). Here, to convert source to null,
-    # we can only perform drop operations.
-    for i in range(rows):
-        matrix[i][0] = i * DROP_COST
+        prev[j] = j * insert_cost
+    prev_min = 0
 
     # now calculate diagonal elements. here we will iterate cols by row to calculate how many operations we need
     # to convert source to target. This conversion will follow below rules,
     # - if source and target characters are same at given diagonal position, cost will be 0 i.e. cost upto previous characters
     # - if source and target characters are not same, then we have 3 options insert, drop and substitute.
     # We will choose operation with the lowest cost
-    for j in range(1, cols):
-        for i in range(1, rows):
-            if s[i-1] == t[j-1]:
-                DIAGONAL_COST = 0
-            else:
-                DIAGONAL_COST = SUBSTITUTE_COST
-            matrix[i][j] = min(matrix[i][j-1] + INSERT_COST,
-                               matrix[i-1][j] + DROP_COST,
-                               matrix[i-1][j-1] + DIAGONAL_COST)
+    s_prev = None
+    for i in range(1, rows):
+        s_cur = s[i-1]
+        # comparisons are cheaper than calling min() and max()
+        lo = i - band if i - band > 1 else 1
+        hi = i + band if i + band < cols - 1 else cols - 1
+        if lo > 1:
+            cur[lo-1] = exceeded
+        else:
+            # calculate cost of first column (vertical). Here, to convert source to null,
+            # we can only perform drop operations.
+            cur[0] = i * drop_cost
+        if hi < cols - 1:
+            cur[hi+1] = exceeded
+
+        # costs of left and diagonal cells are carried over from previous iteration instead of indexing rows again.
+        # Previous chars are None for first row/col, so that transpose lookup never matches there.
+        left = cur[lo-1]
+        diagonal = prev[lo-1]
+        t_prev = t[lo-2] if lo > 1 else None
+        for j in range(lo, hi + 1):
+            t_cur = t[j-1]
+            up = prev[j]
+            # pick the cheapest of insert, drop and substitute
+            cost = left + insert_cost
+            if up + drop_cost < cost:
+                cost = up + drop_cost
+            if s_cur == t_cur:
+                if diagonal < cost:
+                    cost = diagonal
+            elif diagonal + substitute_cost < cost:
+                cost = diagonal + substitute_cost
             # damerau lookup using transpose operations for frequent scenarios user rearranged chars during typing
             # we will choose lowest value in between old matrix and new one
-            if i > 1 and j > 1 and s[i-1] == t[j-2] and s[i-2] == t[j-1]:
-                matrix[i][j] = min(matrix[i][j],
-                                   matrix[i-2][j-2]+TRANSPOSE_COST)
+            if s_cur == t_prev and s_prev == t_cur and prev2[j-2] + transpose_cost < cost:
+                cost = prev2[j-2] + transpose_cost
+            cur[j] = cost
+            left = cost
+            diagonal = up
+            t_prev = t_cur
+        if max_dist is not None:
+            # costs never decrease along the matrix, so once two consecutive rows (transpose operation can skip one)
+            # exceed `max_dist`, final distance will exceed it too
+            row_min = min(cur[lo-1:hi+1])
+            if row_min > max_dist and prev_min > max_dist:
+                return exceeded
+            prev_min = row_min
+        prev2, prev, cur = prev, cur, prev2
+        s_prev = s_cur
+
+    if max_dist is not None and prev[cols-1] > max_dist:
+        return exceeded
+    return prev[cols-1]
+
+
+@lru_cache(maxsize=8192)
+def _cached_damerau_levenshtein_distance(s, t, max_dist=None):
+    """
+    Memoized `_damerau_levenshtein_distance` used by `calculate_damerau_levenshtein_distance`, where same source
+    and target pairs are frequently requested again. Dictionary matching does not go through this cache,
+    as it would evict all entries for any dictionary larger than cache itself.
 
-    return matrix[rows-1][cols-1]
+    Args:
+        s (bytes): source string encoded by `_encode`
+        t (bytes): target string encoded by `_encode`
+        max_dist (int): if given, stop calculation as soon as distance is known to exceed it
+
+    Returns:
+        Integer value. If `max_dist` is given and distance exceeds it, `max_dist + 1` is returned.
+    """
+    # equal and empty strings are frequent, no need to allocate matrix rows for them
+    if s == t:
+        return 0
+    if not s or not t:
+        # only inserts or only drops are needed
+        dist = len(t) * INSERT_COST + len(s) * DROP_COST
+        if max_dist is not None and dist > max_dist:
+            return max_dist + 1
+        return dist
+    return _damerau_levenshtein_distance(s, t, *_allocate_rows(len(t) + 1), max_dist=max_dist)
+
+
+def clear_distance_cache():
+    """
+    Clear memoized distances. Must be called after changing any of cost constants e.g. INSERT_COST.
+    """
+    _cached_damerau_levenshtein_distance.cache_clear()
+
+
+def calculate_damerau_levenshtein_distance(s, t, max_dist=None):
+    """
+    Calculate Damerau-Levenshtein distance using iterative matrix method.
+
+    Args:
+        s (string): source string
+        t (string): target string
+        max_dist (int): if given, stop calculation as soon as distance is known to exceed it
+
+    Returns:
+        Integer value. If `max_dist` is given and distance exceeds it, `max_dist + 1` is returned.
+    """
+    return _cached_damerau_levenshtein_distance(_encode(s), _encode(t), max_dist)
 
 
 def calculate_resemblance_score(s, t, distance):
@@ -105,10 +261,269 @@ def calculate_resemblance_score(s, t, distance):
         distance (int): damerau-levenshtein distance between source and target string
 
     Returns:
-        Decimal value in range of 0 to 1
+        Float value in range of 0 to 1
     """
-    max_possible_distance = max(len(s), len(t)) * max(INSERT_COST, DROP_COST, SUBSTITUTE_COST, TRANSPOSE_COST)
-    return Decimal(1) - Decimal(distance)/Decimal(max_possible_distance)
+    max_possible_distance = max(len(s), len(t)) * MAX_COST
+    if max_possible_distance == 0:
+        return 0.0
+    return 1.0 - distance / float(max_possible_distance)
+
+
+def _max_allowed_distance(max_len):
+    """
+    Calculate the largest distance which still gives resemblance score at or above RESEMBLANCE_THRESHOLD.
+
+    Args:
+        max_len (int): length of the longer of source and target strings
+
+    Returns:
+        Integer value. Distances above it always score below RESEMBLANCE_THRESHOLD.
+    """
+    max_possible_distance = max_len * MAX_COST
+    if max_possible_distance == 0:
+        return 0
+    max_dist = int((1 - RESEMBLANCE_THRESHOLD) * max_possible_distance)
+    # float arithmetic can round product either way, so correct it to agree exactly with score calculation
+    while 1.0 - (max_dist + 1) / max_possible_distance >= RESEMBLANCE_THRESHOLD:
+        max_dist += 1
+    while max_dist > 0 and 1.0 - max_dist / max_possible_distance < RESEMBLANCE_THRESHOLD:
+        max_dist -= 1
+    return max_dist
+
+
+def _calculate_distances(word, dict_codes, strict=False):
+    """
+    Calculate Damerau-Levenshtein distances of word against every word of dictionary in a single pass.
+
+    Args:
+        word (string): source word, expected in lower case
+        dict_codes (list): dictionary words encoded by `_encode` to be used as targets
+        strict (boolean): bound calculation by RESEMBLANCE_THRESHOLD. Distances of words which can only have score
+            below threshold are not exact. see func `_damerau_levenshtein_distance`
+
+    Returns:
+        List of distances in order of input dictionary
+    """
+    # allocate matrix rows once and reuse them for every word of dictionary
+    rows = _allocate_rows(max([len(i) for i in dict_codes] or [0]) + 1)
+    word = _encode(word)
+    word_len = len(word)
+    distances = []
+    for i in dict_codes:
+        # exact match, no need to fill matrix
+        if i == word:
+            distances.append(0)
+            continue
+        max_dist = None
+        if strict:
+            # words farther than this distance can only have score below RESEMBLANCE_THRESHOLD
+            max_len = len(i) if len(i) > word_len else word_len
+            max_dist = _max_allowed_distance(max_len)
+        distances.append(_damerau_levenshtein_distance(word, i, *rows, max_dist=max_dist))
+    return distances
+
+
+class Trie(object):
+    """
+    Prefix tree of dictionary words, so that dictionary words sharing a prefix also share matrix rows
+    calculated for that prefix. see func `_calculate_trie_distances`
+
+    Tree is packed once into flat parallel lists, one item per node in depth-first order (root excluded),
+    so that it can be walked by a plain loop instead of recursion over node objects.
+    Subtree of node `k` spans nodes `k` to `ends[k] - 1`.
+
+    Attributes:
+        chars (list): char code of each node
+        depths (list): length of prefix represented by each node
+        ends (list): position of first node after subtree of each node
+        max_lens (list): length of the longest word ending at or below each node
+        index_offsets (list): dictionary positions of words ending at node `k` are
+            `indexes[index_offsets[k]:index_offsets[k+1]]`
+        indexes (list): dictionary positions of words, grouped by node
+        root_indexes (list): dictionary positions of empty words
+        max_depth (int): length of the longest word
+    """
+
+    def __init__(self, dict_codes):
+        """
+        Build tree from dictionary words.
+
+        Args:
+            dict_codes (list): dictionary words encoded by `_encode`
+        """
+        self.chars = []
+        self.depths = []
+        self.max_lens = []
+        self.root_indexes = []
+        node_indexes = []
+
+        # words sorted by char codes come in depth-first order, so each word only adds nodes for
+        # chars after its common prefix with previous word
+        path = []
+        prev_word = ()
+        for index in sorted(range(len(dict_codes)), key=lambda i: tuple(dict_codes[i])):
+            word = tuple(dict_codes[index])
+            common = 0
+            while common < len(word) and common < len(prev_word) and word[common] == prev_word[common]:
+                common += 1
+            del path[common:]
+            for depth in range(common, len(word)):
+                path.append(len(self.chars))
+                self.chars.append(word[depth])
+                self.depths.append(depth + 1)
+                self.max_lens.append(0)
+                node_indexes.append([])
+            for node in path:
+                if len(word) > self.max_lens[node]:
+                    self.max_lens[node] = len(word)
+            if path:
+                node_indexes[path[-1]].append(index)
+            else:
+                self.root_indexes.append(index)
+            prev_word = word
+
+        # subtree of node ends where next node at same or lower depth starts
+        count = len(self.chars)
+        self.ends = [count] * count
+        open_nodes = []
+        for node, depth in enumerate(self.depths):
+            while open_nodes and self.depths[open_nodes[-1]] >= depth:
+                self.ends[open_nodes.pop()] = node
+            open_nodes.append(node)
+
+        self.index_offsets = [0]
+        self.indexes = []
+        for indexes in node_indexes:
+            self.indexes.extend(indexes)
+            self.index_offsets.append(len(self.indexes))
+        self.max_depth = max(self.depths or [0])
+
+
+def _calculate_trie_distances(word, trie, dict_codes, strict=False):
+    """
+    Calculate Damerau-Levenshtein distances of word against every word of dictionary by walking dictionary trie.
+
+    Here a row corresponds to target (dictionary) prefix and cols to chars of source word,
+    so this is the same matrix as in `_damerau_levenshtein_distance`, just transposed.
+    Row of each node is calculated from rows of its parent and grandparent, i.e. rows of previous depths.
+
+    Args:
+        word (string): source word, expected in lower case
+        trie (Trie): trie built from `dict_codes`
+        dict_codes (list): dictionary words encoded by `_encode`
+        strict (boolean): skip words which can only have score below RESEMBLANCE_THRESHOLD.
+            Distances of such words are not exact. see func `_damerau_levenshtein_distance`
+
+    Returns:
+        List of distances in order of input dictionary
+    """
+    insert_cost = INSERT_COST
+    drop_cost = DROP_COST
+    substitute_cost = SUBSTITUTE_COST
+    transpose_cost = TRANSPOSE_COST
+
+    word = _encode(word)
+    word_len = len(word)
+    distances = [None] * len(dict_codes)
+
+    # one row per depth, reused by all nodes of that depth. Row of depth 0 is for empty prefix i.e. root.
+    rows = [[i * drop_cost for i in range(word_len + 1)]]
+    rows.extend([0] * (word_len + 1) for _ in range(trie.max_depth))
+    row_mins = [0] * (trie.max_depth + 1)
+    path_chars = [None] * (trie.max_depth + 1)
+    for index in trie.root_indexes:
+        distances[index] = rows[0][word_len]
+
+    chars = trie.chars
+    depths = trie.depths
+    ends = trie.ends
+    index_offsets = trie.index_offsets
+    indexes = trie.indexes
+    count = len(chars)
+    node = 0
+    while node < count:
+        c = chars[node]
+        depth = depths[node]
+        path_chars[depth] = c
+        # Previous chars are None for first row/col, so that transpose lookup never matches there
+        # and `prev2` is never read for nodes of depth 1.
+        parent_char = path_chars[depth-1]
+        prev2 = rows[depth-2]
+        prev = rows[depth-1]
+        cur = rows[depth]
+
+        cur[0] = left = depth * insert_cost
+        diagonal = prev[0]
+        s_prev = None
+        for i in range(1, word_len + 1):
+            s_cur = word[i-1]
+            up = prev[i]
+            cost = up + insert_cost
+            if left + drop_cost < cost:
+                cost = left + drop_cost
+            if s_cur == c:
+                if diagonal < cost:
+                    cost = diagonal
+            elif diagonal + substitute_cost < cost:
+                cost = diagonal + substitute_cost
+            if s_cur == parent_char and s_prev == c and prev2[i-2] + transpose_cost < cost:
+                cost = prev2[i-2] + transpose_cost
+            cur[i] = cost
+            left = cost
+            diagonal = up
+            s_prev = s_cur
+        for index in indexes[index_offsets[node]:index_offsets[node+1]]:
+            distances[index] = cur[word_len]
+
+        if strict and ends[node] > node + 1:
+            # same as in `_damerau_levenshtein_distance`, once two consecutive rows exceed max distance allowed
+            # for the longest word below, none of the words below can reach RESEMBLANCE_THRESHOLD
+            row_min = row_mins[depth] = min(cur)
+            max_len = trie.max_lens[node] if trie.max_lens[node] > word_len else word_len
+            max_dist = _max_allowed_distance(max_len)
+            if row_min > max_dist and row_mins[depth-1] > max_dist:
+                node = ends[node]
+                continue
+        node += 1
+
+    # words in skipped subtrees are known to exceed max distance
+    for index, dist in enumerate(distances):
+        if dist is None:
+            distances[index] = _max_allowed_distance(max(word_len, len(dict_codes[index]))) + 1
+    return distances
+
+
+def _select_matches(word, input_dict, distances, limit=None, strict=False):
+    """
+    Score dictionary words by their distances from word and select best matching ones.
+    see func `get_match_with_score`
+    """
+    suggestions = []
+    word_len = len(word)
+    max_cost = MAX_COST
+    for i, dist in zip(input_dict, distances):
+        # same as `calculate_resemblance_score`, inlined to avoid a function call and repeated lookups per word
+        max_possible_distance = len(i)
+        if word_len > max_possible_distance:
+            max_possible_distance = word_len
+        max_possible_distance *= max_cost
+        score = 1.0 - dist / max_possible_distance if max_possible_distance else 0.0
+        if not strict:
+            suggestions.append((i, score))
+        else:
+            if score >= RESEMBLANCE_THRESHOLD:
+                suggestions.append((i, score))
+
+    # only top `limit` suggestions are required, so avoid sorting all of them. Heap selection pays off only
+    # while `limit` is small compared to number of suggestions, otherwise sorting is faster.
+    # Like sorting, ties are kept in order of dictionary.
+    if limit is None or limit >= len(suggestions):
+        return sorted(suggestions, key=lambda x: x[1], reverse=True)
+    if limit == 1:
+        return [max(suggestions, key=lambda x: x[1])]
+    if limit < len(suggestions) // 2:
+        return heapq.nlargest(limit, suggestions, key=lambda x: x[1])
+    return sorted(suggestions, key=lambda x: x[1], reverse=True)[:limit]
 
 
 def get_match_with_score(word, input_dict, limit=None, strict=False):
@@ -123,19 +538,19 @@ def get_match_with_score(word, input_dict, limit=None, strict=False):
     Returns:
         List of tuples of possible matching words with resemblance score
         e.g.[('foo', 0.9111), ('Bar', 0.6543), ('Baz', 0.333)]"""
-    suggestions = []
-    for i in input_dict:
-        dist = calculate_damerau_levenshtein_distance(word.lower(), i)
-        score = calculate_resemblance_score(word, i, dist)
-        if not strict:
-            suggestions.append((i, score))
-        else:
-            if score >= Decimal(0.4):
-                suggestions.append((i, score))
+    distances = _calculate_distances(word.lower(), [_encode(i) for i in input_dict], strict)
+    return _select_matches(word, input_dict, distances, limit, strict)
 
-    if limit is None or limit > len(suggestions):
-        return sorted(suggestions, key=lambda x: x[1], reverse=True)
-    return sorted(suggestions, key=lambda x: x[1], reverse=True)[:limit]
+
+def _analyze_word_cached(word, input_dict, dict_codes, trie, limit=1, strict=False):
+    """
+    Same as `analyze_word`, but uses dictionary already encoded by `_encode` i.e. `dict_codes` and trie built from it,
+    both prepared by caller. see func `analyze_paragraph`
+    """
+    distances = _calculate_trie_distances(word.lower(), trie, dict_codes, strict)
+    match_with_scores = _select_matches(word, input_dict, distances, limit, strict)
+    suggestions = [i[0] for i in match_with_scores]
+    return word, suggestions
 
 
 def analyze_word(word, input_dict, limit=1, strict=False):
@@ -157,26 +572,72 @@ def analyze_word(word, input_dict, limit=1, strict=False):
     return word, suggestions
 
 
-def analyze_paragraph(text, input_dict):
+# dictionary prepared by `analyze_paragraph`, set in each worker process. see func `_init_worker`
+_worker_state = None
+
+
+def _init_worker(input_dict, dict_codes, trie):
+    """
+    Initialize worker process of `analyze_paragraph` with prepared dictionary, so that it is sent to
+    each worker only once instead of with every word.
+    """
+    global _worker_state
+    _worker_state = (input_dict, dict_codes, trie)
+
+
+def _analyze_word_in_worker(word):
+    """
+    Analyze word in worker process against dictionary set by `_init_worker`.
+    """
+    input_dict, dict_codes, trie = _worker_state
+    return _analyze_word_cached(word, input_dict, dict_codes, trie, strict=True)
+
+
+def analyze_paragraph(text, input_dict, workers=None):
     """
     Analyze given paragraph again input dictionary to find wrong words and return possible suggestions.
 
     Args:
         text (string): text to analyze
         input_dict (list): input dict to match against text paragraph
+        workers (int): number of processes to analyze words in parallel. Useful for large dictionaries.
+            If None, words are analyzed in current process.
 
     Returns:
-        list of tuples of word and possible matches.
+        list of tuples of word and possible matches, in order of first appearance of word in text.
+        Words are matched case-insensitively, so only first appearance of a word is reported.
     """
-    result = []
-    text_list = text.split()
-    for word in set(text_list):
+    # prepare dictionary once for all words of paragraph
+    dict_lower = [i.lower() for i in input_dict]
+    dict_set = frozenset(dict_lower)
+    dict_codes = [_encode(i) for i in dict_lower]
+    trie = Trie(dict_codes)
+
+    # collect every distinct word once, in order of first appearance. Words are read lazily from text
+    # instead of splitting whole text into list.
+    words = []
+    seen = set()
+    for match in re.finditer(r'\S+', text):
+        word = match.group()
+        word_lower = word.lower()
+        if word_lower in seen:
+            continue
+        seen.add(word_lower)
         # If word not present in dict, then only try to match suggestion
-        if word.lower() not in input_dict:
-            word, suggestions = analyze_word(word, input_dict, strict=True)
-            if suggestions:
-                result.append((word, suggestions))
-    return result
+        if word_lower not in dict_set:
+            words.append(word)
+
+    # Distance calculation is pure Python and holds GIL, so words are analyzed in separate processes
+    # instead of threads.
+    if workers is not None and workers > 1 and len(words) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(input_dict, dict_codes, trie)) as executor:
+            chunksize = max(1, len(words) // (workers * 4))
+            analyzed = list(executor.map(_analyze_word_in_worker, words, chunksize=chunksize))
+    else:
+        analyzed = [_analyze_word_cached(word, input_dict, dict_codes, trie, strict=True) for word in words]
+
+    return [(word, suggestions) for word, suggestions in analyzed if suggestions]
 
 
 def parse_text_file(filename):
@@ -212,10 +673,12 @@ if __name__ == "__main__":
     ap.add_argument("-t", help="Input text to be analyzed")
     ap.add_argument("-f", help="Input file path containing text to be analyzed")
     ap.add_argument("-d", help="Input file path of dictionary to be used with analyzer. Each new word should be on new line.")
+    ap.add_argument("-w", type=int, help="Number of processes to analyze words in parallel. Useful for large dictionaries.")
     args = vars(ap.parse_args())
     text_path = args["f"]
     text = args["t"]
     dict_path = args["d"]
+    workers = args["w"]
 
     # Give preference over text if both -t and -f present
     if not text:
@@ -235,6 +698,6 @@ if __name__ == "__main__":
         input_dict = DEFAULT_ENGLISH_DICT
 
     # finally pass text and input dict to analyzer
-    result = analyze_paragraph(text, input_dict)
-    for word, suggestions in result:
-        print("%s => %s" %(word, ",".join(suggestions)))
+    result = analyze_paragraph(text, input_dict, workers)
+    # write all lines at once instead of printing line by line
+    sys.stdout.writelines("%s => %s\n" % (word, ",".join(suggestions)) for word, suggestions in result)